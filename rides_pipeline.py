@@ -1,7 +1,89 @@
 import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import pandas as pd
 from ride_params import ncr_ride_bookings
 
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.feather as feather
+except ImportError:
+    pa = None
+    pc = None
+    feather = None
+
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+# The Arrow CSV reader and Arrow-backed dtypes need pyarrow and pandas >= 2.0;
+# otherwise fall back to pandas' own parser and NumPy-backed columns.
+ARROW_BACKEND = pa is not None and int(pd.__version__.split(".")[0]) >= 2
+
+# Low-cardinality text columns in the NCR dataset, stored as categoricals.
+CATEGORICAL_COLUMNS = ("Pickup Location", "Drop Location", "Vehicle Type")
+
+# Accepted logging_level names, resolved without a getattr on the module.
+_LEVELS = {
+    "NOTSET": logging.NOTSET,
+    "DEBUG": logging.DEBUG,
+    "INFO": logging.INFO,
+    "WARN": logging.WARN,
+    "WARNING": logging.WARNING,
+    "ERROR": logging.ERROR,
+    "CRITICAL": logging.CRITICAL,
+    "FATAL": logging.FATAL,
+}
+
+# Shared by every RideBookings instance; attached to the logger only once.
+_FORMATTER = logging.Formatter(
+    "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+_HANDLER = logging.StreamHandler()
+_HANDLER.setFormatter(_FORMATTER)
+
+# Identifier columns that arrive padded with whitespace and quotes.
+ID_COLUMNS = ("Customer ID", "Booking ID")
+
+# Translation table that deletes double quotes from ID values.
+_QUOTE_STRIP = str.maketrans("", "", '"')
+
+# CSVs smaller than this are cheap to parse, so no Feather cache is written.
+CACHE_MIN_BYTES = 1 << 20
+
+
+def _clean_id(value):
+    """Strip whitespace and quotes from a single ID value, if it is a string."""
+    if isinstance(value, str):
+        return value.strip().translate(_QUOTE_STRIP)
+    return value
+
+
+def _strip_ids(series):
+    """Vectorised form of _clean_id for a whole string column."""
+    cleaned = series.str.strip().str.replace('"', "", regex=False)
+    if series.dtype == object:
+        # The str accessor turns non-string cells into NaN; restore them.
+        cleaned = cleaned.where(cleaned.notna(), series)
+    return cleaned
+
+
+def _is_arrow_string(dtype):
+    """Whether dtype is an Arrow string type whose offsets give lengths."""
+    return isinstance(dtype, pd.ArrowDtype) and (
+        pa.types.is_string(dtype.pyarrow_dtype)
+        or pa.types.is_large_string(dtype.pyarrow_dtype)
+    )
+
+
+def _count_empty_arrow_strings(series):
+    """Count empty strings in an Arrow-backed column from its offsets alone."""
+    lengths = pc.binary_length(pa.array(series.array))
+    return pc.sum(pc.equal(lengths, 0)).as_py() or 0
+
 
 class RideBookings:
     """
@@ -9,13 +91,21 @@ class RideBookings:
     
     This class handles:
     - Logging configuration
-    - Reading the CSV file
+    - Reading the CSV file (with a Feather cache for repeat runs)
     - Detecting duplicate rows
     - Cleaning specific string-based columns
+    - Storing low-cardinality columns as categoricals
     - Running a full data preparation pipeline
     """
 
-    def __init__(self, csv_path=ncr_ride_bookings, logging_level="INFO"):
+    def __init__(
+        self,
+        csv_path=ncr_ride_bookings,
+        logging_level="INFO",
+        chunksize=None,
+        categorical_columns=CATEGORICAL_COLUMNS,
+        usecols=None,
+    ):
         """
         Initialize the RideBookings pipeline.
 
@@ -25,10 +115,35 @@ class RideBookings:
             Path to the source CSV file.
         logging_level : str, optional
             Logging verbosity level (DEBUG, INFO, WARNING, ERROR).
+        chunksize : int, optional
+            If set, load_pipeline streams the CSV in chunks of this many rows
+            to bound peak memory. None reads the file in one pass.
+        categorical_columns : sequence of str, optional
+            Columns converted to the category dtype after cleaning. Columns
+            missing from the data are ignored.
+        usecols : list of str, optional
+            Only these columns are read from the CSV (or the cache). None
+            reads every column. Callables are not supported, since neither
+            the Arrow reader nor the Feather cache can select columns with
+            one.
+
+        Raises
+        ------
+        TypeError
+            If usecols is not a list of column names.
         """
+        if usecols is not None and (
+            callable(usecols) or isinstance(usecols, str)
+        ):
+            raise TypeError("usecols must be a list of column names.")
+
         self.initialize_logging(logging_level)
         self.df = None
         self.csv_path = csv_path
+        self.chunksize = chunksize
+        self.categorical_columns = categorical_columns
+        self.usecols = usecols
+        self.cache_path = str(csv_path) + ".feather"
 
     def initialize_logging(self, logging_level):
         """
@@ -39,25 +154,27 @@ class RideBookings:
         logging_level : str
             Logging verbosity level.
         """
-        logger_name = __name__ + ".RideBookings"
-        self.logger = logging.getLogger(logger_name)
+        self.logger = logging.getLogger("rides_pipeline.RideBookings")
         self.logger.propagate = False
 
-        log_level = getattr(logging, logging_level.upper(), logging.INFO)
+        log_level = _LEVELS.get(logging_level.upper(), logging.INFO)
         self.logger.setLevel(log_level)
 
         if not self.logger.handlers:
-            handler = logging.StreamHandler()
-            formatter = logging.Formatter(
-                "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-            )
-            handler.setFormatter(formatter)
-            self.logger.addHandler(handler)
+            self.logger.addHandler(_HANDLER)
 
     def read_csv_file(self):
         """
         Load the CSV file into a pandas DataFrame.
 
+        A Feather cache next to the CSV is used instead of parsing when it is
+        newer than the CSV; otherwise the CSV is parsed and the cache rewritten.
+
+        When pyarrow is available the file is parsed by the multithreaded
+        Arrow CSV reader and columns are backed by Arrow arrays, so string
+        columns are stored as contiguous UTF-8 buffers rather than one
+        Python object per cell.
+
         Returns
         -------
         DataFrame
@@ -70,22 +187,143 @@ class RideBookings:
         Exception
             Any other file reading issue.
         """
+        self.df = self._read_cache()
+        if self.df is not None:
+            self.logger.info("Loaded cached data from %s.", self.cache_path)
+            return self.df
+
         try:
-            self.df = pd.read_csv(self.csv_path)
+            self.df = self._parse_csv()
             self.logger.info("CSV file read successfully.")
+            self._write_cache()
             return self.df
 
-        except pd.errors.EmptyDataError as exc:
+        except Exception as exc:
+            self._log_read_error(exc)
+            raise exc
+
+    def _log_read_error(self, exc):
+        """
+        Log why reading the CSV failed.
+
+        Parameters
+        ----------
+        exc : Exception
+            The error raised while reading.
+        """
+        if isinstance(exc, pd.errors.EmptyDataError):
             self.logger.error(
                 "The file path does not point to a valid CSV. "
                 "Check ride_params.py and try again."
             )
-            raise exc
+        else:
+            self.logger.error("Failed to read CSV. Error: %s", exc)
+
+    def _parse_csv(self):
+        """
+        Parse the CSV file with the fastest reader available.
+
+        Returns
+        -------
+        DataFrame
+            The parsed dataset.
+        """
+        if not ARROW_BACKEND:
+            return pd.read_csv(self.csv_path, usecols=self.usecols)
+
+        try:
+            return pd.read_csv(
+                self.csv_path,
+                usecols=self.usecols,
+                engine="pyarrow",
+                dtype_backend="pyarrow",
+            )
+        except pd.errors.ParserError as exc:
+            # The Arrow reader reports empty files as a generic parse error.
+            if "Empty CSV file" in str(exc):
+                raise pd.errors.EmptyDataError(str(exc)) from exc
+            raise
+
+    def read_csv_in_chunks(self):
+        """
+        Stream the CSV file in chunks, cleaning each chunk as it is read.
+
+        Only one raw chunk is held alongside the cleaned ones at a time, so
+        parser buffers never cover the whole file. The Feather cache is not
+        used in this mode.
+
+        Returns
+        -------
+        DataFrame
+            The loaded and cleaned dataset.
+
+        Raises
+        ------
+        EmptyDataError
+            If the file is empty or incorrect.
+        Exception
+            Any other file reading issue.
+        """
+        read_kwargs = {"chunksize": self.chunksize, "usecols": self.usecols}
+        if ARROW_BACKEND:
+            read_kwargs["dtype_backend"] = "pyarrow"
+
+        chunks = []
+        try:
+            with pd.read_csv(self.csv_path, **read_kwargs) as reader:
+                for chunk in reader:
+                    self.df = chunk
+                    self.apply_corrections()
+                    chunks.append(self.df)
 
         except Exception as exc:
-            self.logger.error(f"Failed to read CSV. Error: {exc}")
+            self._log_read_error(exc)
             raise exc
 
+        self.df = pd.concat(chunks, ignore_index=True)
+        self.logger.info("CSV file read successfully in %d chunks.", len(chunks))
+        return self.df
+
+    def _read_cache(self):
+        """
+        Load the Feather cache if it is newer than the CSV file.
+
+        Returns
+        -------
+        DataFrame or None
+            The cached dataset, or None if there is no usable cache.
+        """
+        if not ARROW_BACKEND:
+            return None
+
+        try:
+            if os.path.getmtime(self.cache_path) <= os.path.getmtime(self.csv_path):
+                return None
+            table = feather.read_table(self.cache_path, columns=self.usecols)
+        except (OSError, pa.ArrowInvalid):
+            return None
+
+        return table.to_pandas(types_mapper=pd.ArrowDtype)
+
+    def _write_cache(self):
+        """
+        Write the freshly parsed DataFrame to the Feather cache.
+
+        Skipped for small CSVs and for column subsets, so the cache always
+        holds every column. Failures are logged rather than raised since the
+        cache is only an optimisation.
+        """
+        if not ARROW_BACKEND or self.usecols is not None:
+            return
+
+        try:
+            if os.path.getsize(self.csv_path) < CACHE_MIN_BYTES:
+                return
+            table = pa.Table.from_pandas(self.df, preserve_index=False)
+            feather.write_feather(table, self.cache_path, compression="zstd")
+        except (OSError, pa.ArrowException) as exc:
+            self.logger.warning("Could not write cache file. Error: %s", exc)
+
     def number_of_duplicates(self, subset=None):
         """
         Count duplicate rows in the dataset.
@@ -108,26 +346,83 @@ class RideBookings:
         if self.df is None:
             raise ValueError("CSV not loaded. Call read_csv_file() first.")
 
-        dup_count = self.df.duplicated(subset=subset).sum()
+        if subset is None:
+            # Drop and count in a single hashing pass over the rows.
+            deduplicated = self.df.drop_duplicates()
+            dup_count = len(self.df) - len(deduplicated)
 
-        if dup_count > 0:
-            if subset:
+            if dup_count > 0:
+                self.df = deduplicated
                 self.logger.info(
-                    f"Dataset contains {dup_count} duplicates based on {subset}."
+                    "%d exact duplicate rows in the Dataset have been dropped",
+                    dup_count,
                 )
             else:
-                self.df = self.df.drop_duplicates()
+                self.logger.info("No exact duplicate rows found.")
+        else:
+            if duckdb is not None and self._is_arrow_backed(subset):
+                dup_count = self._count_duplicates_in_duckdb(subset)
+            else:
+                dup_count = int(
+                    self.df.duplicated(subset=subset, keep="first").sum()
+                )
+
+            if dup_count > 0:
                 self.logger.info(
-                    f"{dup_count} exact duplicate rows in the Dataset have been dropped"
+                    "Dataset contains %d duplicates based on %s.", dup_count, subset
                 )
-        else:
-            if subset:
-                self.logger.info(f"No duplicates found based on {subset}.")
             else:
-                self.logger.info("No exact duplicate rows found.")
+                self.logger.info("No duplicates found based on %s.", subset)
 
         return dup_count
 
+    def _is_arrow_backed(self, subset):
+        """
+        Check that every subset column is Arrow-backed.
+
+        Only Arrow columns are handed to DuckDB: their types map one-to-one,
+        whereas object columns can mix values (e.g. 5 and 5.0) that DuckDB
+        and pandas compare differently. Missing columns return False so the
+        pandas path raises its usual KeyError.
+        """
+        if isinstance(subset, str):
+            subset = [subset]
+        return all(
+            isinstance(self.df.dtypes.get(col), pd.ArrowDtype) for col in subset
+        )
+
+    def _count_duplicates_in_duckdb(self, subset):
+        """
+        Count rows that repeat an earlier row on the subset columns, in DuckDB.
+
+        DuckDB scans the frame in place and only keeps a hash set of the
+        distinct keys, instead of a boolean mask over every row.
+
+        Parameters
+        ----------
+        subset : list of str
+            Columns that identify a duplicate.
+
+        Returns
+        -------
+        int
+            Number of duplicate rows on the subset.
+        """
+        if isinstance(subset, str):
+            subset = [subset]
+        columns = ", ".join('"' + col.replace('"', '""') + '"' for col in subset)
+
+        con = duckdb.connect()
+        try:
+            con.register("rides", self.df)
+            unique_rows = con.execute(
+                f"SELECT COUNT(*) FROM (SELECT DISTINCT {columns} FROM rides)"
+            ).fetchone()[0]
+        finally:
+            con.close()
+
+        return len(self.df) - unique_rows
+
     def clean_columns(self, value):
         """
         Clean individual cell values: strips whitespace and removes quotes.
@@ -142,23 +437,51 @@ class RideBookings:
         any
             Cleaned value if string; otherwise unchanged.
         """
-        if isinstance(value, str):
-            return value.strip().replace('"', "")
-        return value
+        return _clean_id(value)
 
     def check_blanks_in_columns(self):
         """
         Log the number of blank (NaN) values in each column of the DataFrame.
 
-        Uses the logger to report counts for all columns.
+        Uses the logger to report counts for all columns. The scan is skipped
+        when INFO messages would not be emitted.
         """
         if self.df is None:
             self.logger.warning("DataFrame not loaded. Call read_csv_file() first.")
             return
 
+        # The counts are only ever logged, so skip the scan if INFO is off.
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+
         for column in self.df.columns:
-            empty_rows = self.df[column].isna().sum() + (self.df[column] == '').sum()
-            self.logger.info(f"{column} column contains {empty_rows} blank values.")
+            series = self.df[column]
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                # Work on the integer codes, never the category values.
+                codes = series.cat.codes
+                empty_rows = (codes == -1).sum()
+                if '' in series.cat.categories:
+                    empty_code = series.cat.categories.get_loc('')
+                    empty_rows += (codes == empty_code).sum()
+            elif _is_arrow_string(series.dtype):
+                empty_rows = series.isna().sum()
+                empty_rows += _count_empty_arrow_strings(series)
+            elif isinstance(series.dtype, pd.StringDtype):
+                empty_rows = series.isna().sum() + (series == '').sum()
+            elif series.dtype == object:
+                # One array for both masks; skip null cells such as pd.NA,
+                # which cannot be compared to ''.
+                arr = series.to_numpy(copy=False)
+                mask = pd.isna(arr)
+                mask |= np.equal(arr, '', out=np.zeros_like(mask), where=~mask)
+                empty_rows = mask.sum()
+            else:
+                # Numeric, datetime and other typed columns hold no strings.
+                empty_rows = series.isna().sum()
+
+            self.logger.info(
+                "%s column contains %d blank values.", column, empty_rows
+            )
 
 
     def apply_corrections(self):
@@ -169,10 +492,42 @@ class RideBookings:
         - 'Customer ID'
         - 'Booking ID'
         """
+        if self.df is None:
+            return
+
+        # A chunk where a column is entirely blank has no string dtype.
+        cols_to_clean = [
+            col for col in ID_COLUMNS
+            if col in self.df.columns
+            and pd.api.types.is_string_dtype(self.df[col].dtype)
+        ]
+        columns = [self.df[col] for col in cols_to_clean]
+
+        # Arrow string kernels release the GIL, so Arrow-backed columns can be
+        # cleaned concurrently; object columns gain nothing from threads.
+        if len(columns) > 1 and all(
+            isinstance(column.dtype, pd.ArrowDtype) for column in columns
+        ):
+            with ThreadPoolExecutor(max_workers=len(columns)) as executor:
+                cleaned = list(executor.map(_strip_ids, columns))
+        else:
+            cleaned = [_strip_ids(column) for column in columns]
+
+        for col, values in zip(cols_to_clean, cleaned):
+            self.df[col] = values
+
+    def convert_to_categories(self):
+        """
+        Store the configured low-cardinality columns as categoricals.
+
+        Each distinct value is kept once and rows hold integer codes. Run
+        after apply_corrections so values differing only by whitespace or
+        quotes collapse into one category.
+        """
         if self.df is not None:
-            cols_to_clean = ["Customer ID", "Booking ID"]
-            for col in cols_to_clean:
-                self.df[col] = self.df[col].apply(self.clean_columns)
+            for col in self.categorical_columns:
+                if col in self.df.columns:
+                    self.df[col] = self.df[col].astype("category")
 
     def load_pipeline(self):
         """
@@ -180,11 +535,22 @@ class RideBookings:
 
         Steps:
         1. Read CSV file
-        2. Check for duplicates
-        3. Clean selected columns
-        4. Log the number of blank (NaN) values in each column of the DataFrame.
+        2. Clean selected columns
+        3. Convert low-cardinality columns to categoricals
+        4. Check for duplicates
+        5. Log the number of blank (NaN) values in each column of the DataFrame.
+
+        Duplicates are checked on the cleaned, categorised data, so rows that
+        only differ by whitespace or quotes in their IDs count as duplicates.
+        When ``chunksize`` is set, columns are cleaned chunk by chunk while
+        reading; both modes keep the same rows and values. The chunked reader
+        does not infer date or time types, so such columns stay strings there.
         """
-        self.read_csv_file()
+        if self.chunksize:
+            self.read_csv_in_chunks()
+        else:
+            self.read_csv_file()
+            self.apply_corrections()
+        self.convert_to_categories()
         self.number_of_duplicates()
-        self.apply_corrections()
         self.check_blanks_in_columns()
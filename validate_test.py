@@ -1,6 +1,9 @@
+import logging
+import os
 import pandas as pd
 import pytest
 from unittest.mock import patch
+import rides_pipeline
 from rides_pipeline import RideBookings
 
 
@@ -11,9 +14,13 @@ def pipeline():
     return rb
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_df():
-    """A small mock DataFrame that mimics the structure of the real data."""
+    """
+    A small mock DataFrame that mimics the structure of the real data.
+
+    Built once per module; tests that mutate the frame must work on a copy.
+    """
     return pd.DataFrame({
         "Customer ID": [' "C001" ', "C002", "C003", "C003"],
         "Booking ID": [' "B101" ', "B102", "B103", "B103"],
@@ -39,6 +46,27 @@ class TestReadCSV:
             with pytest.raises(pd.errors.EmptyDataError):
                 pipeline.read_csv_file()
 
+    def test_read_csv_raises_empty_data_error_on_real_empty_file(self, tmp_path):
+        """An empty file on disk should surface as EmptyDataError with any reader."""
+        empty_csv = tmp_path / "empty.csv"
+        empty_csv.write_text("")
+        rb = RideBookings(csv_path=str(empty_csv))
+        with pytest.raises(pd.errors.EmptyDataError):
+            rb.read_csv_file()
+
+    def test_read_csv_only_loads_requested_columns(self, tmp_path):
+        """usecols should restrict the columns parsed from the CSV."""
+        csv_file = tmp_path / "rides.csv"
+        csv_file.write_text("Customer ID,Booking ID,Fare\nC001,B101,150.0\n")
+        rb = RideBookings(csv_path=str(csv_file), usecols=["Fare"])
+        rb.read_csv_file()
+        assert list(rb.df.columns) == ["Fare"]
+
+    def test_rejects_callable_usecols(self):
+        """usecols must name columns; callables would break the cache."""
+        with pytest.raises(TypeError, match="usecols"):
+            RideBookings(csv_path="dummy_path.csv", usecols=lambda col: True)
+
     def test_read_csv_raises_on_generic_error(self, pipeline):
         """Pipeline should raise on any other file-reading failure."""
         with patch("pandas.read_csv", side_effect=FileNotFoundError("No file")):
@@ -46,6 +74,71 @@ class TestReadCSV:
                 pipeline.read_csv_file()
 
 
+@pytest.mark.skipif(not rides_pipeline.ARROW_BACKEND, reason="requires pyarrow")
+class TestFeatherCache:
+    @pytest.fixture
+    def csv_file(self, tmp_path, monkeypatch):
+        """A real CSV on disk, with the cache size threshold disabled."""
+        monkeypatch.setattr(rides_pipeline, "CACHE_MIN_BYTES", 0)
+        path = tmp_path / "rides.csv"
+        path.write_text("Customer ID,Booking ID,Fare\nC001,B101,150.0\n")
+        # Backdate the CSV so a freshly written cache is strictly newer.
+        os.utime(path, (0, 0))
+        return str(path)
+
+    def test_writes_cache_after_parsing(self, csv_file):
+        """Parsing the CSV should leave a Feather cache next to it."""
+        rb = RideBookings(csv_path=csv_file)
+        rb.read_csv_file()
+        assert os.path.exists(rb.cache_path)
+
+    def test_reads_fresh_cache_without_parsing(self, csv_file):
+        """A cache newer than the CSV should be loaded instead of the CSV."""
+        RideBookings(csv_path=csv_file).read_csv_file()
+        rb = RideBookings(csv_path=csv_file)
+        with patch("pandas.read_csv", side_effect=AssertionError("CSV parsed")):
+            rb.read_csv_file()
+        assert rb.df["Customer ID"].tolist() == ["C001"]
+
+    def test_ignores_stale_cache(self, csv_file):
+        """A cache older than the CSV should be ignored and rebuilt."""
+        rb = RideBookings(csv_path=csv_file)
+        rb.read_csv_file()
+        os.utime(rb.cache_path, (0, 0))
+        os.utime(csv_file, None)
+        with patch("pandas.read_csv", return_value=pd.DataFrame({"Fare": [1.0]})) as mock:
+            rb.read_csv_file()
+        mock.assert_called_once()
+
+    def test_reads_column_subset_from_cache(self, csv_file):
+        """A full cache should serve runs that only need some columns."""
+        RideBookings(csv_path=csv_file).read_csv_file()
+        rb = RideBookings(csv_path=csv_file, usecols=["Booking ID"])
+        with patch("pandas.read_csv", side_effect=AssertionError("CSV parsed")):
+            rb.read_csv_file()
+        assert list(rb.df.columns) == ["Booking ID"]
+
+    def test_skips_cache_for_small_files(self, csv_file, monkeypatch):
+        """CSVs under the size threshold should not be cached."""
+        monkeypatch.setattr(rides_pipeline, "CACHE_MIN_BYTES", 1 << 20)
+        rb = RideBookings(csv_path=csv_file)
+        rb.read_csv_file()
+        assert not os.path.exists(rb.cache_path)
+
+
+class TestLogging:
+    @pytest.mark.parametrize("name", ["NOTSET", "debug", "WARN", "FATAL"])
+    def test_level_names_match_logging_module(self, name):
+        """Level names should resolve as the logging module defines them."""
+        rb = RideBookings(csv_path="dummy_path.csv", logging_level=name)
+        assert rb.logger.level == getattr(logging, name.upper())
+
+    def test_unknown_level_falls_back_to_info(self):
+        """Unrecognised level names should fall back to INFO."""
+        rb = RideBookings(csv_path="dummy_path.csv", logging_level="LOUD")
+        assert rb.logger.level == logging.INFO
+
+
 class TestDuplicates:
     def test_raises_if_csv_not_loaded(self, pipeline):
         """Should raise ValueError if read_csv_file() hasn't been called."""
@@ -66,15 +159,82 @@ class TestDuplicates:
         # 4 rows originally, 1 duplicate dropped -> 3 unique rows
         assert len(pipeline.df) == 3
 
+    def test_keeps_original_index_labels(self, pipeline):
+        """Dropping duplicates should keep the surviving rows' labels."""
+        pipeline.df = pd.DataFrame({"Customer ID": ["C1", "C1", "C2"]}, index=[10, 11, 12])
+        pipeline.number_of_duplicates()
+        assert pipeline.df.index.tolist() == [10, 12]
+
+    def test_returns_plain_int(self, pipeline, sample_df):
+        """Counts should be plain ints whichever path computes them."""
+        pipeline.df = sample_df
+        with patch("rides_pipeline.duckdb", None):
+            assert type(pipeline.number_of_duplicates(subset=["Customer ID"])) is int
+        pipeline.df = sample_df.copy()
+        assert type(pipeline.number_of_duplicates()) is int
+
     def test_detects_subset_duplicates(self, pipeline, sample_df):
         """Should count duplicates based on a column subset without dropping rows."""
-        pipeline.df = sample_df.copy()
+        pipeline.df = sample_df
         count = pipeline.number_of_duplicates(subset=["Customer ID"])
         # "C003" appears twice -> 1 duplicate on that subset
         assert count == 1
         # Subset mode should NOT drop rows
         assert len(pipeline.df) == 4
 
+    @pytest.mark.skipif(not rides_pipeline.ARROW_BACKEND, reason="requires pyarrow")
+    def test_logs_subset_duplicates(self, pipeline, sample_df, caplog):
+        """Subset counts should be logged whichever engine computes them."""
+        pipeline.df = sample_df.convert_dtypes(dtype_backend="pyarrow")
+        pipeline.logger.propagate = True
+        with caplog.at_level("INFO", logger="rides_pipeline.RideBookings"):
+            pipeline.number_of_duplicates(subset=["Customer ID"])
+            pipeline.df = pipeline.df.iloc[:2]
+            pipeline.number_of_duplicates(subset=["Customer ID"])
+        assert "Dataset contains 1 duplicates based on ['Customer ID']" in caplog.text
+        assert "No duplicates found based on ['Customer ID']" in caplog.text
+
+    def test_subset_duplicates_without_duckdb(self, pipeline, sample_df):
+        """The pandas fallback should match when DuckDB is not installed."""
+        pipeline.df = sample_df
+        with patch("rides_pipeline.duckdb", None):
+            count = pipeline.number_of_duplicates(subset=["Customer ID", "Fare"])
+        assert count == 1
+
+    def test_subset_duplicates_match_pandas_on_mixed_objects(self, pipeline):
+        """Object columns with mixed values should be counted like pandas."""
+        pipeline.df = pd.DataFrame({
+            "Customer ID": ["C1", 5, "C1", 5.0, None],
+            "Fare": [1.0, None, 1.0, None, None],
+        })
+        expected = pipeline.df.duplicated(subset=["Customer ID"]).sum()
+        assert pipeline.number_of_duplicates(subset=["Customer ID"]) == expected == 2
+
+    @pytest.mark.skipif(not rides_pipeline.ARROW_BACKEND, reason="requires pyarrow")
+    @pytest.mark.skipif(rides_pipeline.duckdb is None, reason="requires duckdb")
+    def test_duckdb_matches_pandas_on_arrow_nulls(self, pipeline):
+        """DuckDB should treat null keys as equal, like DataFrame.duplicated."""
+        pa = rides_pipeline.pa
+        pipeline.df = pd.DataFrame({
+            "Customer ID": pd.array(
+                ["C1", None, "C1", None, "C2"], dtype=pd.ArrowDtype(pa.string())
+            ),
+            "Fare": pd.array(
+                [1.0, None, 1.0, None, 2.0], dtype=pd.ArrowDtype(pa.float64())
+            ),
+        })
+        subset = ["Customer ID", "Fare"]
+        expected = pipeline.df.duplicated(subset=subset).sum()
+        assert pipeline._count_duplicates_in_duckdb(subset) == expected == 2
+        assert pipeline.number_of_duplicates(subset=subset) == expected
+
+    @pytest.mark.skipif(not rides_pipeline.ARROW_BACKEND, reason="requires pyarrow")
+    def test_subset_duplicates_missing_column(self, pipeline, sample_df):
+        """An unknown subset column should raise KeyError as in pandas."""
+        pipeline.df = sample_df.convert_dtypes(dtype_backend="pyarrow")
+        with pytest.raises(KeyError):
+            pipeline.number_of_duplicates(subset=["Customer ID", "Missing"])
+
     def test_no_duplicates(self, pipeline):
         """Should return 0 when there are no duplicates."""
         pipeline.df = pd.DataFrame({
@@ -104,19 +264,66 @@ class TestApplyCorrections:
         assert pipeline.df["Customer ID"].iloc[0] == "C001"
         assert pipeline.df["Booking ID"].iloc[0] == "B101"
 
+    @pytest.mark.skipif(not rides_pipeline.ARROW_BACKEND, reason="requires pyarrow")
+    def test_cleans_arrow_backed_columns(self, pipeline, sample_df):
+        """Arrow-backed ID columns should be cleaned the same way."""
+        pipeline.df = sample_df.convert_dtypes(dtype_backend="pyarrow")
+        pipeline.apply_corrections()
+        assert pipeline.df["Customer ID"].iloc[0] == "C001"
+        assert pipeline.df["Booking ID"].iloc[0] == "B101"
+
     def test_does_not_touch_other_columns(self, pipeline, sample_df):
-        """Columns not in cols_to_clean should remain unchanged."""
+        """Columns not in ID_COLUMNS should remain unchanged."""
         pipeline.df = sample_df.copy()
         original_pickup = pipeline.df["Pickup Location"].tolist()
         pipeline.apply_corrections()
         assert pipeline.df["Pickup Location"].tolist() == original_pickup
 
+    def test_keeps_non_string_cells_in_mixed_columns(self, pipeline):
+        """Non-string IDs in an object column should pass through untouched."""
+        pipeline.df = pd.DataFrame({
+            "Customer ID": [' "C1" ', 5, 3.5, None],
+            "Booking ID": ["B1", "B2", "B3", "B4"],
+        })
+        pipeline.apply_corrections()
+        assert pipeline.df["Customer ID"].tolist()[:3] == ["C1", 5, 3.5]
+        assert pd.isna(pipeline.df["Customer ID"].iloc[3])
+
+    def test_skips_missing_columns(self, pipeline):
+        """Target columns excluded from the load should be skipped."""
+        pipeline.df = pd.DataFrame({"Booking ID": [' "B101" ']})
+        pipeline.apply_corrections()
+        assert pipeline.df["Booking ID"].iloc[0] == "B101"
+
     def test_does_nothing_if_df_is_none(self, pipeline):
         """Should not raise an error if df hasn't been loaded yet."""
         pipeline.df = None
         pipeline.apply_corrections()  # Should simply do nothing
 
 
+class TestConvertToCategories:
+    def test_converts_configured_columns(self, sample_df):
+        """Configured columns present in the data should become categoricals."""
+        rb = RideBookings(
+            csv_path="dummy_path.csv",
+            categorical_columns=("Pickup Location", "Missing Column"),
+        )
+        rb.df = sample_df.copy()
+        rb.convert_to_categories()
+        assert isinstance(rb.df["Pickup Location"].dtype, pd.CategoricalDtype)
+        assert rb.df["Dropoff Location"].dtype == object
+
+    def test_duplicate_count_unchanged(self, sample_df):
+        """Categorical columns should not change the duplicate count."""
+        rb = RideBookings(
+            csv_path="dummy_path.csv",
+            categorical_columns=("Pickup Location", "Dropoff Location"),
+        )
+        rb.df = sample_df.copy()
+        rb.convert_to_categories()
+        assert rb.number_of_duplicates() == 1
+
+
 class TestCheckBlanks:
     def test_logs_blank_counts(self, pipeline, caplog):
         """Should log the correct number of blanks per column."""
@@ -131,6 +338,60 @@ class TestCheckBlanks:
         assert "Customer ID column contains 1 blank values" in caplog.text
         assert "Booking ID column contains 1 blank values" in caplog.text
 
+    @pytest.mark.skipif(not rides_pipeline.ARROW_BACKEND, reason="requires pyarrow")
+    def test_logs_blank_counts_for_arrow_columns(self, pipeline, caplog):
+        """Arrow-backed columns should count nulls and empty strings alike."""
+        pipeline.df = pd.DataFrame({
+            "Customer ID": ["C001", None, ""],
+            "Fare": [150.0, None, 200.0],
+        }).convert_dtypes(dtype_backend="pyarrow")
+        pipeline.logger.propagate = True
+        with caplog.at_level("INFO", logger="rides_pipeline.RideBookings"):
+            pipeline.check_blanks_in_columns()
+
+        assert "Customer ID column contains 2 blank values" in caplog.text
+        assert "Fare column contains 1 blank values" in caplog.text
+
+    @pytest.mark.skipif(not rides_pipeline.ARROW_BACKEND, reason="requires pyarrow")
+    def test_logs_blank_counts_for_non_string_arrow_columns(self, pipeline, caplog):
+        """Arrow columns that are not strings should only count nulls."""
+        pipeline.df = pd.DataFrame({
+            "Time": pd.Series(
+                pd.to_datetime(["12:29:38", None]).time,
+                dtype=pd.ArrowDtype(rides_pipeline.pa.time64("us")),
+            ),
+            "Booking ID": pd.Series(
+                ["CNR1", ""], dtype=pd.ArrowDtype(rides_pipeline.pa.large_string())
+            ),
+        })
+        pipeline.logger.propagate = True
+        with caplog.at_level("INFO", logger="rides_pipeline.RideBookings"):
+            pipeline.check_blanks_in_columns()
+
+        assert "Time column contains 1 blank values" in caplog.text
+        assert "Booking ID column contains 1 blank values" in caplog.text
+
+    def test_logs_blank_counts_for_categorical_columns(self, pipeline, caplog):
+        """Categorical columns should count missing codes and the '' category."""
+        pipeline.df = pd.DataFrame({
+            "Drop Location": pd.Categorical(["Noida", "", None, "Pune"]),
+        })
+        pipeline.logger.propagate = True
+        with caplog.at_level("INFO", logger="rides_pipeline.RideBookings"):
+            pipeline.check_blanks_in_columns()
+
+        assert "Drop Location column contains 2 blank values" in caplog.text
+
+    def test_skips_scan_when_info_disabled(self, caplog):
+        """Nothing should be computed or logged above INFO level."""
+        rb = RideBookings(csv_path="dummy_path.csv", logging_level="WARNING")
+        rb.df = pd.DataFrame({"Customer ID": ["C001", None]})
+        rb.logger.propagate = True
+        with patch.object(pd.DataFrame, "isna") as mock_isna:
+            rb.check_blanks_in_columns()
+        mock_isna.assert_not_called()
+        assert "blank values" not in caplog.text
+
     def test_warns_if_df_not_loaded(self, pipeline, caplog):
         """Should log a warning and return early if df is None."""
         pipeline.df = None
@@ -152,6 +413,61 @@ class TestLoadPipeline:
         assert pipeline.df["Customer ID"].iloc[0] == "C001"
         assert pipeline.df["Booking ID"].iloc[0] == "B101"
 
+    @pytest.mark.skipif(not rides_pipeline.ARROW_BACKEND, reason="requires pyarrow")
+    def test_pipeline_on_ncr_shaped_csv(self, tmp_path, caplog):
+        """Arrow time columns and blank categorical cells should be counted."""
+        csv_file = tmp_path / "rides.csv"
+        csv_file.write_text(
+            "Time,Booking ID,Customer ID,Drop Location\n"
+            '12:29:38,"""CNR1""","""CID1""",Noida\n'
+            '13:29:38,"""CNR2""","""CID2""",\n'
+        )
+        rb = RideBookings(csv_path=str(csv_file))
+        rb.logger.propagate = True
+        with caplog.at_level("INFO", logger="rides_pipeline.RideBookings"):
+            rb.load_pipeline()
+
+        assert isinstance(rb.df["Drop Location"].dtype, pd.CategoricalDtype)
+        assert "Time column contains 0 blank values" in caplog.text
+        assert "Drop Location column contains 1 blank values" in caplog.text
+
+    def test_chunked_pipeline_cleans_and_dedupes_whole_file(self, tmp_path):
+        """Streaming the CSV in chunks should clean and dedupe the whole file."""
+        csv_file = tmp_path / "rides.csv"
+        csv_file.write_text(
+            "Customer ID,Booking ID,Fare\n"
+            '" C001 ",B101,150.0\n'
+            "C002,B102,200.0\n"
+            "C003,B103,150.0\n"
+            "C003,B103,150.0\n"
+            ",,\n"
+        )
+        rb = RideBookings(csv_path=str(csv_file), chunksize=2)
+        rb.load_pipeline()
+
+        # The duplicate C003 row spans two chunks and is still dropped.
+        assert len(rb.df) == 4
+        assert rb.df["Customer ID"].iloc[0] == "C001"
+        assert pd.isna(rb.df["Customer ID"].iloc[3])
+
+    def test_chunked_and_single_pass_return_same_frame(self, tmp_path):
+        """Chunking bounds memory only; both modes clean, then dedupe."""
+        csv_file = tmp_path / "rides.csv"
+        csv_file.write_text(
+            "Customer ID,Booking ID,Fare\n"
+            '" C001 ",B101,150.0\n'
+            "C001,B101,150.0\n"
+            "C002,B102,200.0\n"
+        )
+        single = RideBookings(csv_path=str(csv_file))
+        single.load_pipeline()
+        chunked = RideBookings(csv_path=str(csv_file), chunksize=2)
+        chunked.load_pipeline()
+
+        # The two C001 rows only match once cleaned, so one is dropped.
+        assert single.df["Customer ID"].tolist() == ["C001", "C002"]
+        pd.testing.assert_frame_equal(single.df, chunked.df)
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])